@@ -1,9 +1,21 @@
 import sys
 import re
 import html
+import warnings
+from functools import lru_cache
 from unidecode import unidecode
 from lxml import etree
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+    warnings.warn("pyahocorasick no está instalado; la búsqueda de keywords usará Python puro y será más lenta.")
+
+_TAG_RE       = re.compile(r"<[^>]+>")
+_ACCENT_TABLE = str.maketrans("áàäâãéèëêíìïîóòöôõúùüûñç", "aaaaaeeeeiiiiooooouuuunc")
+
+@lru_cache(maxsize=4096)
 def cleanLabelText(rawText: str) -> str:
     """
     Decodifica HTML y elimina etiquetas, devolviendo solo texto plano.
@@ -16,17 +28,22 @@ def cleanLabelText(rawText: str) -> str:
     """
     if rawText is None : return ""
     decoded     = html.unescape(rawText)
-    withoutTags = re.sub(r"<[^>]+>", " ", decoded).strip()
+    if "<" not in decoded : return decoded.strip()
+    withoutTags = _TAG_RE.sub(" ", decoded).strip()
     return withoutTags
 
 
 
 
 
+@lru_cache(maxsize=4096)
 def normalizeText(inputText: str) -> str:
     """
     Convierte un texto a minúsculas, elimina acentos y espacios extra.
 
+    Los acentos del español se reemplazan con una tabla de traducción; solo
+    si queda algún carácter no ASCII se recurre a unidecode.
+
     Args:
         inputText (str): Texto a normalizar.
 
@@ -36,7 +53,9 @@ def normalizeText(inputText: str) -> str:
     """
     if inputText is None : return ""
     lowerCaseText       = inputText.strip().lower()
-    textWithoutAccents  = unidecode(lowerCaseText)
+    textWithoutAccents  = lowerCaseText.translate(_ACCENT_TABLE)
+    if not textWithoutAccents.isascii():
+        textWithoutAccents = unidecode(textWithoutAccents)
     words               = textWithoutAccents.split()
     cleanedText         = " ".join(words)
     return cleanedText
@@ -82,6 +101,10 @@ def loadMappingFile(filePath: str) -> dict:
     """
     Carga un diccionario con formato clave => feature en el proyecto.
 
+    Claves y features se internan, ya que las features se repiten entre
+    entradas y se comparan al agrupar resultados. Las entradas con clave
+    vacía se ignoran: no identifican ninguna keyword.
+
     Args:
         filePath (str): Ruta al archivo de configuración.
 
@@ -89,18 +112,19 @@ def loadMappingFile(filePath: str) -> dict:
         dict: Diccionario con claves normalizadas y sus features asociadas.
     """
     mapping = {}
-    
+
     with open(filePath, encoding="utf-8") as file:
-        for line in file:
-            cleanedLine = line.strip()
-
-            if cleanedLine is None : continue
-            if "=>" not in cleanedLine : continue
-            
-            keyPart, featurePart = cleanedLine.split("=>", 1)
-            normalizedKey = normalizeText(keyPart)
-            normalizedFeature = featurePart.strip()
-            mapping[normalizedKey] = normalizedFeature
+        fileContent = file.read()
+
+    for line in fileContent.splitlines():
+        keyPart, separator, featurePart = line.partition("=>")
+        if not separator : continue
+
+        normalizedKey = sys.intern(normalizeText(keyPart))
+        if not normalizedKey : continue
+
+        normalizedFeature = sys.intern(featurePart.strip())
+        mapping[normalizedKey] = normalizedFeature
     return mapping
 
 
@@ -115,7 +139,7 @@ def loadAllMappingFiles(configDirectory: str) -> dict:
         configDirectory (str): Carpeta donde están los archivos de configuración.
 
     Returns:
-        dict: Diccionario con los mapeos agrupados por categoría.
+        dict: Diccionario con los mapeos agrupados por categoría, sin keywords redundantes.
     """
     categories          = ["algorithms", "nfrs", "backend", "integration"]
     categoryMappings    = {}
@@ -123,7 +147,7 @@ def loadAllMappingFiles(configDirectory: str) -> dict:
     for category in categories:
         filePath        = f"{configDirectory}/{category}.txt"
         mapping         = loadMappingFile(filePath)
-        categoryMappings[category] = mapping
+        categoryMappings[category] = pruneRedundantKeywords(mapping)
 
     return categoryMappings
 
@@ -131,90 +155,246 @@ def loadAllMappingFiles(configDirectory: str) -> dict:
 
 
 
-def parseIStarXml(xmlFilePath: str) -> list:
+def pruneRedundantKeywords(mapping: dict) -> dict:
     """
-    Parsea un archivo XML de i* a una estructura Python como diccionarios.
+    Elimina keywords que contienen a otra keyword más corta de la misma feature.
+
+    Si "quantum" y "quantum hardware" apuntan ambas a Hardware, todo texto que
+    contenga la segunda también contiene la primera, por lo que buscarla no
+    aporta nada. Keywords de features distintas se conservan siempre.
 
     Args:
-        xml_file (str): Ruta al archivo XML de entrada.
+        mapping (dict): Diccionario de keywords de una categoría.
+
+    Returns:
+        dict: Diccionario sin keywords redundantes, agrupado por feature en el
+              orden en que aparecen en el archivo.
+    """
+    keywordsByFeature = {feature: [] for feature in mapping.values()}
+
+    for keyword in sorted(mapping, key=len):
+        shorterKeywords = keywordsByFeature[mapping[keyword]]
+        if any(shorter in keyword for shorter in shorterKeywords) : continue
+        shorterKeywords.append(keyword)
+
+    prunedMapping = {}
+    for feature, keywords in keywordsByFeature.items():
+        for keyword in keywords:
+            prunedMapping[keyword] = feature
+    return prunedMapping
+
+
+
+
+
+def collectMappingFeatures(mappingDictionaries: dict) -> dict:
+    """
+    Obtiene las features distintas de cada categoría, una sola vez al cargar.
+
+    Se usa un dict como conjunto ordenado: permite consultar pertenencia en
+    O(1) y conserva el orden de aparición en el archivo de mapeo.
+
+    Args:
+        mappingDictionaries (dict): Diccionarios de keywords por categoría.
 
     Returns:
-        list: Lista de diccionarios con 'type', 'label' y 'norm'.
+        dict: Features distintas por categoría, en el orden del archivo de mapeo.
+    """
+    mappingFeatures = {}
+
+    for category, mapping in mappingDictionaries.items():
+        mappingFeatures[category] = dict.fromkeys(mapping.values())
+
+    return mappingFeatures
+
+
+
+
+
+def buildKeywordAutomaton(mappingDictionaries: dict):
+    """
+    Construye un único autómata Aho-Corasick con las keywords de todas las categorías.
+
+    Cada keyword guarda los pares (categoría, feature) a los que apunta, así
+    una sola pasada sobre el texto resuelve las cuatro categorías a la vez.
+    Si pyahocorasick no está instalado se devuelve la tabla de keywords tal
+    cual, para la búsqueda en Python puro de iterKeywordMatches.
+
+    Args:
+        mappingDictionaries (dict): Diccionarios de keywords por categoría.
+
+    Returns:
+        ahocorasick.Automaton | dict: Autómata (o tabla) con tuplas de
+                                      (categoría, feature) como valor.
+    """
+    keywordMatches = {}
+
+    for category, mapping in mappingDictionaries.items():
+        for keyword, feature in mapping.items():
+            matches = keywordMatches.get(keyword, ())
+            keywordMatches[keyword] = matches + ((category, feature),)
+
+    if ahocorasick is None : return keywordMatches
+
+    automaton = ahocorasick.Automaton()
+    for keyword, matches in keywordMatches.items():
+        automaton.add_word(keyword, matches)
+    automaton.make_automaton()
+    return automaton
+
+
+
+
+
+def iterKeywordMatches(automaton, text: str):
+    """
+    Recorre las features cuyas keywords aparecen en el texto.
+
+    Args:
+        automaton   : Autómata (o tabla) generado por buildKeywordAutomaton.
+        text (str)  : Texto normalizado donde buscar.
+
+    Yields:
+        tuple: Categoría y feature asociadas a cada keyword encontrada.
+    """
+    if ahocorasick is None:
+        for keyword, matches in automaton.items():
+            if keyword in text : yield from matches
+        return
+
+    if automaton.kind != ahocorasick.AHOCORASICK : return
+    for _, matches in automaton.iter(text):
+        yield from matches
+
+
+
+
+
+def parseIStarXml(xmlFilePath: str):
     """
-    tree    = etree.parse(xmlFilePath)
-    result  = []
+    Parsea un archivo XML de i* y entrega sus objetos uno a uno.
 
-    for obj in tree.xpath("//object"):
+    El XML se recorre en streaming: cada <object> se libera apenas se procesa,
+    junto con los nodos anteriores, para no mantener el árbol completo en memoria.
+
+    Args:
+        xml_file (str): Ruta al archivo XML de entrada.
+
+    Yields:
+        tuple: 'type', 'label' y 'norm' de cada objeto.
+    """
+    context = etree.iterparse(xmlFilePath, events=("end",), tag="object")
+
+    for _, obj in context:
         rawLabel        = obj.get("label", "")
         label           = cleanLabelText(rawLabel)
         rawType         = obj.get("type", "")
-        typeText        = rawType.lower() if rawType else ""
-        normalizedLabel = normalizeText(label)
-        objData         = {
-            "type"  : typeText,
-            "label" : label,
-            "norm"  : normalizedLabel
-        }
-        result.append(objData)
-    return result
+        typeText        = sys.intern(rawType.lower()) if rawType else ""
+        normalizedLabel = sys.intern(normalizeText(label))
 
+        obj.clear()
+        while obj.getprevious() is not None:
+            del obj.getparent()[0]
+        yield typeText, label, normalizedLabel
 
 
 
 
-def mapIStarObjectsToFeatures(objectList: list, mappingDictionaries: dict):
+
+def mapIStarObjectsToFeatures(objects, mappingFeatures: dict, keywordAutomaton):
     """
     Asigna objetos i* a features UVL según los diccionarios de mapeo.
 
+    Los objetos se consumen en una sola pasada: en ella se detecta el goal
+    raíz y se acumulan los textos normalizados distintos (los labels repetidos
+    se escanean una sola vez) en un único buffer separado por saltos de línea,
+    que nunca aparecen en un texto normalizado. Así una sola llamada al
+    autómata resuelve todos los objetos y todas las categorías; el recorrido
+    se corta apenas se han encontrado todas las features posibles.
+
+    Args:
+        objects                 : Objetos (type, label, norm) generados por parseIStarXml.
+        mappingFeatures (dict)  : Features por categoría generadas por collectMappingFeatures.
+        keywordAutomaton        : Autómata generado por buildKeywordAutomaton.
+
+    Returns:
+        tuple: Label del goal raíz y listas de algoritmos, NFRs, backends
+               e integraciones, en el orden de los archivos de mapeo.
+    """
+    rootLabel       = ""
+    normalizedTexts = {}
+    for typeText, label, normalizedLabel in objects:
+        if rootLabel == "" and typeText == "goal" and label.strip() != "":
+            rootLabel = label
+        normalizedTexts[normalizedLabel] = None
+
+    packedText          = "\n".join(normalizedTexts)
+    foundFeatures       = {category: set() for category in mappingFeatures}
+    pendingFeatures     = sum(len(features) for features in mappingFeatures.values())
+    for category, feature in iterKeywordMatches(keywordAutomaton, packedText):
+        features = foundFeatures[category]
+        if feature in features : continue
+
+        features.add(feature)
+        pendingFeatures -= 1
+        if pendingFeatures == 0 : break
+
+    algos   = foundFeatures["algorithms"]
+    nfrs    = foundFeatures["nfrs"]
+    backs   = foundFeatures["backend"]
+    integrs = foundFeatures["integration"]
+
+    backs, integrs = applyDefaultValues(backs, integrs, mappingFeatures)
+    return (
+        rootLabel,
+        orderByMapping(algos, mappingFeatures["algorithms"]),
+        orderByMapping(nfrs, mappingFeatures["nfrs"]),
+        orderByMapping(backs, mappingFeatures["backend"]),
+        orderByMapping(integrs, mappingFeatures["integration"]),
+    )
+
+
+
+
+
+def orderByMapping(features: set, categoryFeatures: dict) -> list:
+    """
+    Ordena las features según su primera aparición en el archivo de mapeo.
+
     Args:
-        objectList (list)           : Objetos con 'norm' generado por parseIStarXml.
-        mappingDictionaries (dict)  : Diccionarios de keywords por categoría.
+        features (set)          : Features encontradas en una categoría.
+        categoryFeatures (dict) : Features distintas de esa categoría, en orden.
 
     Returns:
-        tuple: Listas ordenadas de algoritmos, NFRs, backends e integraciones.
+        list: Features encontradas, en el orden del archivo de mapeo.
     """
-    algos   = set()
-    nfrs    = set()
-    backs   = set()
-    integrs = set()
-    for obj in objectList:
-        txt = obj["norm"]
-        for keyword, feature in mappingDictionaries["algorithms"].items():
-            if keyword in txt : algos.add(feature)
-        
-        for keyword, feature in mappingDictionaries["nfrs"].items():
-            if keyword in txt : nfrs.add(feature)
-        
-        for keyword, feature in mappingDictionaries["backend"].items():
-            if keyword in txt : backs.add(feature)
-        
-        for keyword, feature in mappingDictionaries["integration"].items():
-            if keyword in txt : integrs.add(feature)
-    
-    backs, integrs = applyDefaultValues(backs, integrs, mappingDictionaries)
-    return sorted(algos), sorted(nfrs), sorted(backs), sorted(integrs)
-
-
-
-
-
-def applyDefaultValues(backs: set, integrs: set, mappingDictionaries: dict):
+    orderedFeatures = []
+
+    for feature in categoryFeatures:
+        if feature in features:
+            orderedFeatures.append(feature)
+
+    return orderedFeatures
+
+
+
+
+
+def applyDefaultValues(backs: set, integrs: set, mappingFeatures: dict):
     """
     Agrega valores por defecto a backend e integración si no hay detecciones.
 
     Args:
-        backs (set)                 : Conjunto de backends encontrados.
-        integrs (set)               : Conjunto de integraciones encontradas.
-        mappingDictionaries (dict)  : Diccionarios de mapeo por categoría.
+        backs (set)             : Conjunto de backends encontrados.
+        integrs (set)           : Conjunto de integraciones encontradas.
+        mappingFeatures (dict)  : Features por categoría generadas por collectMappingFeatures.
 
     Returns:
         tuple: Conjuntos actualizados de backends e integraciones.
     """
-    backendValues       = mappingDictionaries["backend"].values()
-    integrationValues   = mappingDictionaries["integration"].values()
-    if len(backs) == 0 and "Hardware" in backendValues:
+    if len(backs) == 0 and "Hardware" in mappingFeatures["backend"]:
         backs.add("Hardware")
-    if len(integrs) == 0 and "Middleware" in integrationValues:
+    if len(integrs) == 0 and "Middleware" in mappingFeatures["integration"]:
         integrs.add("Middleware")
     return backs, integrs
 
@@ -222,49 +402,47 @@ def applyDefaultValues(backs: set, integrs: set, mappingDictionaries: dict):
 
 
 
-def buildUvlModel(rootFeature: str, algos: list, nfrs: list, backs: list, integrs: list) -> str:
+def writeUvlModel(outputFile, rootFeature: str, algos: list, nfrs: list, backs: list, integrs: list):
     """
-    Construye el modelo UVL como texto a partir de las features detectadas.
+    Escribe el modelo UVL directamente en un archivo a partir de las features detectadas.
+
+    Cada línea se escribe apenas se genera, sin acumular el modelo completo
+    en memoria.
 
     Args:
+        outputFile          : Archivo de texto abierto en modo escritura.
         rootFeature (str)   : Nombre de la feature raíz.
         algos (list)        : Algoritmos.
         nfrs (list)         : Requerimientos no funcionales.
         backs (list)        : Backends.
         integrs (list)      : Integraciones.
-
-    Returns:
-        str: Representación UVL en formato de texto.
     """
-    lines = []
-    lines.append("features {")
-    lines.append(f"  {rootFeature} {{")
+    outputFile.write("features {\n")
+    outputFile.write(f"  {rootFeature} {{\n")
     if len(algos) > 0:
-        lines.append("    Algorithm {")
+        outputFile.write("    Algorithm {\n")
         for algo in algos:
-            lines.append(f"      {algo}")
-        lines.append("    }")
+            outputFile.write(f"      {algo}\n")
+        outputFile.write("    }\n")
     if len(backs) > 0:
-        lines.append("    Backend {")
+        outputFile.write("    Backend {\n")
         for back in backs:
-            lines.append(f"      {back}")
-        lines.append("    }")
+            outputFile.write(f"      {back}\n")
+        outputFile.write("    }\n")
     if len(integrs) > 0:
-        lines.append("    IntegrationModel {")
+        outputFile.write("    IntegrationModel {\n")
         for integr in integrs:
-            lines.append(f"      {integr}")
-        lines.append("    }")
+            outputFile.write(f"      {integr}\n")
+        outputFile.write("    }\n")
     for n in nfrs:
-        lines.append(f"    {n}")
-    lines.append("  }")
-    lines.append("}")
-    lines.append("")
+        outputFile.write(f"    {n}\n")
+    outputFile.write("  }\n")
+    outputFile.write("}\n")
     if len(algos) > 0 and "Precision" in nfrs:
-        lines.append("constraints {")
+        outputFile.write("\nconstraints {\n")
         for algo in algos:
-            lines.append(f"  {algo} requires Precision")
-        lines.append("}")
-    return "\n".join(lines)
+            outputFile.write(f"  {algo} requires Precision\n")
+        outputFile.write("}")
 
 
 
@@ -275,7 +453,7 @@ def generateUvlFromIStarXml(inputXmlFile: str, outputUvlFile: str, configDirecto
     Genera un modelo UVL a partir de un XML de i*.
 
     Carga los diccionarios de mapeo, parsea el XML, detecta el goal raíz,
-    asigna features y construye el modelo UVL que se guarda en archivo.
+    asigna features y escribe el modelo UVL en el archivo de salida.
 
     Args:
         inputXmlFile (str)              : Ruta al archivo XML de entrada (i*).
@@ -283,18 +461,14 @@ def generateUvlFromIStarXml(inputXmlFile: str, outputUvlFile: str, configDirecto
         configDirectory (str, optional) : Carpeta con los archivos de mapeo.
     """
     mappingDictionaries = loadAllMappingFiles(configDirectory)
-    objectList          = parseIStarXml(inputXmlFile)
-    
-    for obj in objectList:
-        if obj["type"] == "goal" and obj["label"].strip() != "":
-            rootLabel = obj["label"]
-            break
-  
+    mappingFeatures     = collectMappingFeatures(mappingDictionaries)
+    keywordAutomaton    = buildKeywordAutomaton(mappingDictionaries)
+    objects             = parseIStarXml(inputXmlFile)
+
+    rootLabel, algos, nfrs, backs, integrs = mapIStarObjectsToFeatures(objects, mappingFeatures, keywordAutomaton)
     rootFeature = formatRootFeatureName(rootLabel)
-    algos, nfrs, backs, integrs = mapIStarObjectsToFeatures(objectList, mappingDictionaries)
-    uvlContent = buildUvlModel(rootFeature, algos, nfrs, backs, integrs)
     with open(outputUvlFile, "w", encoding="utf-8") as outputFile:
-        outputFile.write(uvlContent)
+        writeUvlModel(outputFile, rootFeature, algos, nfrs, backs, integrs)
     print(f"UVL generado en {outputUvlFile}")
 
 